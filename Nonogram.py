@@ -1,10 +1,128 @@
 import time  # For measuring execution time
+import ctypes  # For the optional compiled domain filter
 import os    # For file path operations
-from typing import List, Tuple, Set  # For type hints
+import random  # For randomized value ordering between restarts
+from concurrent.futures import ProcessPoolExecutor  # For parallel domain generation
+from functools import lru_cache
+from itertools import combinations, count, repeat  # For enumerating block placements
+from math import comb
+from typing import FrozenSet, List, Optional, Set, Tuple  # For type hints
+
+import numpy as np  # For vectorized domain filtering
+
+try:
+    from numba import njit  # Optional: compiles the uint64 domain kernel to native code
+except ImportError:
+    njit = None
+
+# Total line configurations above which domain generation is spread over worker processes
+PARALLEL_DOMAIN_THRESHOLD = 200_000
+# Fewer cores than this cannot win back the cost of starting the pool and shipping domains back
+PARALLEL_DOMAIN_MIN_CPUS = 4
+# Domain size from which the compiled filter beats NumPy once its ctypes call overhead is paid
+COMPILED_FILTER_MIN_SIZE = 1024
+
+def count_line_possibilities(blocks: Tuple[int, ...], length: int) -> int:
+    """ Count the configurations of a line without enumerating them. """
+    blocks = [block for block in blocks if block]
+    remaining_space = length - (sum(blocks) + len(blocks) - 1)
+    if not blocks:
+        return 1
+    if remaining_space < 0:
+        return 0
+    return comb(remaining_space + len(blocks), len(blocks))
+
+def luby(i: int) -> int:
+    """ Return the i-th term (from 1) of the Luby restart sequence 1, 1, 2, 1, 1, 2, 4, 1, ... """
+    while True:
+        k = i.bit_length()
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+@lru_cache(maxsize=None)
+def line_possibilities(blocks: Tuple[int, ...], length: int) -> FrozenSet[int]:
+    """ Generate all possible line configurations for given blocks as bitmasks (bit j is cell j), cached per clue. """
+    # Ignore zero-length blocks (a lone 0 clue marks an empty line)
+    blocks = [block for block in blocks if block]
+    if not blocks:
+        return frozenset([0])
+
+    # Calculate space requirements
+    total_blocks = sum(blocks)
+    total_gaps = len(blocks) - 1  # Gaps between blocks
+    remaining_space = length - (total_blocks + total_gaps)
+
+    # Check if configuration is possible
+    if remaining_space < 0:
+        return frozenset()
+
+    # Block t starts at (cells of earlier blocks) + (its index among the chosen slots),
+    # so choosing len(blocks) of remaining_space + len(blocks) slots enumerates every layout
+    block_bits = [(1 << block) - 1 for block in blocks]
+    prefix_blocks = [0] * len(blocks)
+    for t in range(1, len(blocks)):
+        prefix_blocks[t] = prefix_blocks[t - 1] + blocks[t - 1]
+    placements = list(zip(block_bits, prefix_blocks))
+
+    possibilities = []
+    for combo in combinations(range(remaining_space + len(blocks)), len(blocks)):
+        mask = 0
+        for idx, (bits, prefix) in zip(combo, placements):
+            mask |= bits << (idx + prefix)
+        possibilities.append(mask)
+    return frozenset(possibilities)
+
+def line_possibilities_array(blocks: Tuple[int, ...], length: int) -> np.ndarray:
+    """ line_possibilities as a uint64 array, which crosses a process boundary as one buffer instead of a pickled set. """
+    masks = line_possibilities(blocks, length)
+    return np.fromiter(masks, dtype=np.uint64, count=len(masks))
+
+if njit is not None:
+    @njit(cache=True)
+    def _filter_project_native(domain, fixed, value):
+        """ Split uint64 configurations into kept/dropped by the decided cells and OR/AND the kept ones in one pass. """
+        parts = np.empty_like(domain)
+        count = 0
+        rejected = domain.size
+        any_on = np.uint64(0)
+        all_on = ~np.uint64(0)
+        for k in range(domain.size):
+            mask = domain[k]
+            if (mask & fixed) == value:
+                parts[count] = mask
+                count += 1
+                any_on |= mask
+                all_on &= mask
+            else:
+                rejected -= 1
+                parts[rejected] = mask
+        return parts[:count].copy(), parts[count:].copy(), any_on, all_on
+else:
+    _filter_project_native = None
+
+def _load_filter_library() -> Optional[ctypes.CDLL]:
+    """ Load the domain filter compiled from filter_domain.c next to this file, or None if it is not built. """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_filter_domain.so')
+    try:
+        library = ctypes.CDLL(path)
+    except OSError:
+        return None
+    # Raw pointers rather than ndpointer arguments: argument checking costs more than filtering a small domain
+    pointer = ctypes.c_void_p
+    library.filter_domain.argtypes = [pointer, ctypes.c_size_t, ctypes.c_uint64, ctypes.c_uint64,
+                                      pointer, pointer, pointer, pointer]
+    library.filter_domain.restype = ctypes.c_size_t
+    return library
+
+_filter_library = _load_filter_library()
 
 class Nono_Solver:
     """Class that solves Nonogram puzzles using constraint propagation and backtracking."""
     
+    # Branching nodes per unit of the Luby sequence before the search restarts
+    RESTART_BUDGET = 300
+
     def __init__(self, filename: str):
         """ Initialize the Nonogram solver with puzzle from file. """
         # Read puzzle constraints from file
@@ -12,11 +130,29 @@ class Nono_Solver:
         # Set grid dimensions
         self.height = len(self.row_constraints)
         self.width = len(self.col_constraints)
-        # Initialize empty grid with None values
-        self.grid = [[None for _ in range(self.width)] for _ in range(self.height)]
+        # Initialize empty grid, -1 marks an undecided cell
+        self.grid = np.full((self.height, self.width), -1, dtype=np.int8)
+        # Bitmasks of decided cells and their values for every row and column
+        self.row_fixed = [0] * self.height
+        self.row_value = [0] * self.height
+        self.col_fixed = [0] * self.width
+        self.col_value = [0] * self.width
         # Generate initial possible configurations for rows and columns
         self.row_domains = self._generate_domains(self.row_constraints, self.width)
         self.col_domains = self._generate_domains(self.col_constraints, self.height)
+        # OR / AND of every line's remaining configurations (cells that can be 1 / must be 1)
+        projections = {id(domain): self._project(domain) for domain in self.row_domains + self.col_domains}
+        self.row_any, self.row_all = map(list, zip(*(projections[id(domain)] for domain in self.row_domains)))
+        self.col_any, self.col_all = map(list, zip(*(projections[id(domain)] for domain in self.col_domains)))
+        # Bitsets of rows / columns whose domain has collapsed to a single configuration
+        self.row_solved = 0
+        self.col_solved = 0
+        # Output buffer reused by the compiled domain filter
+        self._filter_buffer = np.empty(0, dtype=np.uint64)
+        # Per search level: cell assignments and dropped configurations to undo (empty at the root)
+        self.trail = []
+        # Root-level configurations refuted by the search, not yet removed from the root domains
+        self.nogoods = []
 
     def read_puzzle(self, filename: str) -> Tuple[List[List[int]], List[List[int]]]:
         """ Read puzzle clues from file with format: row constraints, blank line, column constraints. """
@@ -40,149 +176,283 @@ class Nono_Solver:
             print(f"Error reading puzzle file: {str(e)}")
             exit(1)
 
-    def generate_line_possibilities(self, blocks: List[int], length: int) -> List[List[int]]:
-        """ Generate all possible line configurations for given blocks. """
-        # Handle empty blocks case
-        if not blocks:
-            return [[0] * length]
-        
-        # Calculate space requirements
-        total_blocks = sum(blocks)
-        total_gaps = len(blocks) - 1  # Gaps between blocks
-        remaining_space = length - (total_blocks + total_gaps)
-        
-        # Check if configuration is possible
-        if remaining_space < 0:
-            return []
-
-        def generate_positions(pos: int, current_blocks: List[int]) -> List[List[int]]:
-            """ Recursive helper function to generate valid block positions. """
-            # Base case: all blocks placed
-            if not current_blocks:
-                line = [0] * length
-                for p in pos_list:
-                    for i in range(p[1]):
-                        line[p[0] + i] = 1
-                return [line]
-            
-            block = current_blocks[0]
-            results = []
-            start = pos
-            max_start = length - sum(current_blocks) - (len(current_blocks) - 1)
-            
-            # Try placing current block at different positions
-            while start <= max_start:
-                if all(p[0] + p[1] <= start for p in pos_list):
-                    pos_list.append((start, block))
-                    results.extend(generate_positions(start + block + 1, current_blocks[1:]))
-                    pos_list.pop()
-                start += 1
-                
-            return results
+    def _generate_domains(self, constraints: List[List[int]], length: int) -> List[np.ndarray]:
+        """ Generate Possible configurations for each line as a uint64 array (object array past 64 cells) """
+        keys = [tuple(blocks) for blocks in constraints]
+        distinct = list(dict.fromkeys(keys))
+        total = sum(count_line_possibilities(key, length) for key in distinct)
+        # Lines with identical clues share one array; propagation only ever replaces domains, never mutates them
+        if length > 64:
+            arrays = {key: np.fromiter(line_possibilities(key, length), dtype=object) for key in distinct}
+        elif (len(distinct) > 1 and (os.cpu_count() or 1) >= PARALLEL_DOMAIN_MIN_CPUS
+                and total >= PARALLEL_DOMAIN_THRESHOLD):
+            # Lines are independent, so enumerate the distinct clues in worker processes
+            with ProcessPoolExecutor() as executor:
+                arrays = dict(zip(distinct, executor.map(line_possibilities_array, distinct, repeat(length))))
+        else:
+            arrays = {key: line_possibilities_array(key, length) for key in distinct}
+        return [arrays[key] for key in keys]
 
-        pos_list = []  # Track block positions
-        return generate_positions(0, blocks)
+    def _set_cell(self, i: int, j: int, value: Optional[int]) -> None:
+        """ Assign a grid cell (None clears it) and keep the row/column bitmasks in sync. """
+        if value is not None and self.trail:
+            self.trail[-1].append(('cell', i, j))
+        self.grid[i, j] = -1 if value is None else value
+        row_bit, col_bit = 1 << j, 1 << i
+        # Clear the cell from both lines, then re-add it if it is being decided
+        self.row_fixed[i] &= ~row_bit
+        self.row_value[i] &= ~row_bit
+        self.col_fixed[j] &= ~col_bit
+        self.col_value[j] &= ~col_bit
+        if value is not None:
+            self.row_fixed[i] |= row_bit
+            self.col_fixed[j] |= col_bit
+            if value:
+                self.row_value[i] |= row_bit
+                self.col_value[j] |= col_bit
 
-    def _generate_domains(self, constraints: List[List[int]], length: int) -> List[Set[tuple]]:
-        """ Generate Possible configurations for each line """
-        return [set(map(tuple, self.generate_line_possibilities(blocks, length))) 
-                for blocks in constraints]
+    def _project(self, domain: np.ndarray) -> Tuple[int, int]:
+        """ Return the OR and AND of all configurations in a line domain. """
+        if not domain.size:
+            return 0, 0
+        return int(np.bitwise_or.reduce(domain)), int(np.bitwise_and.reduce(domain))
 
-    def _update_domains(self) -> bool:
-        """ Update domains based on current grid state using constraint propagation. """
-        changed = True
-        while changed:
-            changed = False
-            
-            # Update row domains based on current grid values
-            for i in range(self.height):
-                new_domain = set()
-                for possibility in self.row_domains[i]:
-                    valid = True
-                    for j, value in enumerate(possibility):
-                        if self.grid[i][j] is not None and self.grid[i][j] != value:
-                            valid = False
-                            break
-                    if valid:
-                        new_domain.add(possibility)
+    def _filter_line(self, domain: np.ndarray, fixed: int, value: int) -> Tuple[np.ndarray, np.ndarray, int, int]:
+        """ Split configurations into those matching the decided cells and the dropped rest, plus OR / AND of the kept. """
+        if _filter_project_native is not None and domain.dtype == np.uint64:
+            kept, dropped, any_on, all_on = _filter_project_native(domain, np.uint64(fixed), np.uint64(value))
+            return kept, dropped, int(any_on), int(all_on)
+        if _filter_library is not None and domain.dtype == np.uint64 and domain.size >= COMPILED_FILTER_MIN_SIZE:
+            return self._filter_line_compiled(domain, fixed, value)
+        keep = (domain & fixed) == value
+        kept = domain[keep]
+        return (kept, domain[~keep], *self._project(kept))
+
+    def _filter_line_compiled(self, domain: np.ndarray, fixed: int, value: int) -> Tuple[np.ndarray, np.ndarray, int, int]:
+        """ _filter_line through the compiled filter_domain kernel, writing into a reused scratch buffer. """
+        size = domain.size
+        # Scratch layout: kept configurations, dropped configurations, then the OR and AND of the kept ones
+        if self._filter_buffer.size < 2 * size + 2:
+            self._filter_buffer = np.empty(2 * size + 2, dtype=np.uint64)
+        buffer = self._filter_buffer
+        start = buffer.ctypes.data
+        count = _filter_library.filter_domain(np.ascontiguousarray(domain).ctypes.data, size, fixed, value,
+                                              start, start + 8 * size, start + 16 * size, start + 16 * size + 8)
+        return (buffer[:count].copy(), buffer[size:2 * size - count].copy(),
+                int(buffer[2 * size]), int(buffer[2 * size + 1]))
+
+    def _implied(self, any_on: int, all_on: int, fixed: int, value: int) -> bool:
+        """ Check whether every configuration already agrees with the decided cells (so filtering drops nothing). """
+        # Cells decided 1 must be on in all configurations, cells decided 0 off in all of them
+        return not (value & ~all_on) and not (any_on & fixed & ~value)
+
+    def _forced_cells(self, any_on: int, all_on: int, fixed: int, length: int) -> List[Tuple[int, int]]:
+        """ Return (index, value) for undecided cells on which every configuration in the line agrees. """
+        forced_on = all_on
+        forced_off = ~any_on & ((1 << length) - 1)
+        pending = (forced_on | forced_off) & ~fixed
+        cells = []
+        while pending:
+            bit = pending & -pending  # Lowest pending bit
+            cells.append((bit.bit_length() - 1, 1 if forced_on & bit else 0))
+            pending ^= bit
+        return cells
+
+    def _update_domains(self, dirty_rows: Optional[Set[int]] = None, dirty_cols: Optional[Set[int]] = None) -> bool:
+        """ Update domains using constraint propagation, revisiting only lines whose cells changed (AC-3 style). """
+        # Every line is dirty unless the caller knows which ones were touched
+        dirty_rows = set(range(self.height)) if dirty_rows is None else dirty_rows
+        dirty_cols = set(range(self.width)) if dirty_cols is None else dirty_cols
+        
+        while dirty_rows or dirty_cols:
+            # Filter dirty row domains and pin cells they agree on, dirtying the crossing columns
+            while dirty_rows:
+                i = dirty_rows.pop()
+                if self.row_solved >> i & 1:
+                    continue  # A settled row has nothing left to filter
+                domain = self.row_domains[i]
+                fixed, value = self.row_fixed[i], self.row_value[i]
+                if domain.size and self._implied(self.row_any[i], self.row_all[i], fixed, value):
+                    new_domain = domain  # Nothing to drop, so skip the O(|domain|) filter
+                else:
+                    new_domain, dropped, any_on, all_on = self._filter_line(domain, fixed, value)
                 
                 # Check for inconsistency
-                if not new_domain:
+                if not new_domain.size:
                     return False
-                if new_domain != self.row_domains[i]:
-                    changed = True
-                    self.row_domains[i] = new_domain
+                if new_domain.size != domain.size:
+                    self._replace_domain('r', i, new_domain, dropped, any_on, all_on)
+                for j, cell in self._forced_cells(self.row_any[i], self.row_all[i], self.row_fixed[i], self.width):
+                    self._set_cell(i, j, cell)
+                    dirty_cols.add(j)
+                if new_domain.size == 1:
+                    self.row_solved |= 1 << i
             
             # Update column domains similarly
-            for j in range(self.width):
-                new_domain = set()
-                for possibility in self.col_domains[j]:
-                    valid = True
-                    for i, value in enumerate(possibility):
-                        if self.grid[i][j] is not None and self.grid[i][j] != value:
-                            valid = False
-                            break
-                    if valid:
-                        new_domain.add(possibility)
+            while dirty_cols:
+                j = dirty_cols.pop()
+                if self.col_solved >> j & 1:
+                    continue
+                domain = self.col_domains[j]
+                fixed, value = self.col_fixed[j], self.col_value[j]
+                if domain.size and self._implied(self.col_any[j], self.col_all[j], fixed, value):
+                    new_domain = domain  # Nothing to drop, so skip the O(|domain|) filter
+                else:
+                    new_domain, dropped, any_on, all_on = self._filter_line(domain, fixed, value)
                 
-                if not new_domain:
+                if not new_domain.size:
                     return False
-                if new_domain != self.col_domains[j]:
-                    changed = True
-                    self.col_domains[j] = new_domain
-            
-            # Find and propagate certain values
-            for i in range(self.height):
-                for j in range(self.width):
-                    if self.grid[i][j] is None:
-                        row_values = {poss[j] for poss in self.row_domains[i]}
-                        col_values = {poss[i] for poss in self.col_domains[j]}
-                        common_values = row_values & col_values
-                        if len(common_values) == 1:
-                            self.grid[i][j] = common_values.pop()
-                            changed = True
+                if new_domain.size != domain.size:
+                    self._replace_domain('c', j, new_domain, dropped, any_on, all_on)
+                for i, cell in self._forced_cells(self.col_any[j], self.col_all[j], self.col_fixed[j], self.height):
+                    self._set_cell(i, j, cell)
+                    dirty_rows.add(i)
+                if new_domain.size == 1:
+                    self.col_solved |= 1 << j
         
         return True
 
+    def _line_state(self, kind: str) -> Tuple[List[np.ndarray], List[int], List[int]]:
+        """ Return the domain and projection lists for rows ('r') or columns ('c'). """
+        if kind == 'r':
+            return self.row_domains, self.row_any, self.row_all
+        return self.col_domains, self.col_any, self.col_all
+
+    def _replace_domain(self, kind: str, index: int, domain: np.ndarray, dropped: np.ndarray,
+                        any_on: int, all_on: int) -> None:
+        """ Install a filtered line domain, trailing only the dropped configurations so backtracking can restore it. """
+        domains, any_masks, all_masks = self._line_state(kind)
+        if self.trail:
+            self.trail[-1].append((kind, index, dropped, any_masks[index], all_masks[index]))
+        domains[index], any_masks[index], all_masks[index] = domain, any_on, all_on
+
+    def _undo_level(self) -> None:
+        """ Revert the cell assignments and domain reductions trailed at the deepest level, newest first. """
+        level = self.trail[-1]
+        while level:
+            entry = level.pop()
+            if entry[0] == 'cell':
+                self._set_cell(entry[1], entry[2], None)
+            else:
+                kind, index, dropped, any_on, all_on = entry
+                domains, any_masks, all_masks = self._line_state(kind)
+                domains[index] = np.concatenate((domains[index], dropped))
+                any_masks[index], all_masks[index] = any_on, all_on
+                # A restored domain has more than one configuration again
+                if kind == 'r':
+                    self.row_solved &= ~(1 << index)
+                else:
+                    self.col_solved &= ~(1 << index)
+
+    def _assign_line(self, kind: str, index: int, mask: int) -> Tuple[Set[int], Set[int]]:
+        """ Fix every undecided cell of a row ('r') or column ('c') to a configuration; return the dirty lines. """
+        if kind == 'r':
+            pending = ~self.row_fixed[index] & ((1 << self.width) - 1)
+        else:
+            pending = ~self.col_fixed[index] & ((1 << self.height) - 1)
+        crossing = set()
+        while pending:
+            bit = pending & -pending  # Lowest pending bit
+            k = bit.bit_length() - 1
+            value = 1 if mask & bit else 0
+            if kind == 'r':
+                self._set_cell(index, k, value)
+            else:
+                self._set_cell(k, index, value)
+            crossing.add(k)
+            pending ^= bit
+        return ({index}, crossing) if kind == 'r' else (crossing, {index})
+
+    def _select_line(self) -> Optional[Tuple[str, int]]:
+        """ Return the unsettled row or column with the fewest configurations, or None if all are settled. """
+        if self.row_solved == (1 << self.height) - 1 and self.col_solved == (1 << self.width) - 1:
+            return None
+        # Cells a line's configurations still disagree on; a line is settled when there are none
+        unknown_row = [any_on & ~all_on for any_on, all_on in zip(self.row_any, self.row_all)]
+        unknown_col = [any_on & ~all_on for any_on, all_on in zip(self.col_any, self.col_all)]
+        # Ties on configuration count go to the line with more unknown cells (popcount), so a branch decides more
+        candidates = [(len(self.row_domains[i]), -bin(unknown).count('1'), 'r', i)
+                      for i, unknown in enumerate(unknown_row) if unknown]
+        candidates += [(len(self.col_domains[j]), -bin(unknown).count('1'), 'c', j)
+                       for j, unknown in enumerate(unknown_col) if unknown]
+        if not candidates:
+            return None
+        _, _, kind, index = min(candidates)
+        return kind, index
+
+    def _apply_nogoods(self) -> bool:
+        """ Remove refuted root-level configurations from the root domains and propagate; False if none remain. """
+        dirty_rows, dirty_cols = set(), set()
+        while self.nogoods:
+            kind, index, mask = self.nogoods.pop()
+            domains, any_masks, all_masks = self._line_state(kind)
+            domains[index] = domains[index][domains[index] != mask]
+            any_masks[index], all_masks[index] = self._project(domains[index])
+            (dirty_rows if kind == 'r' else dirty_cols).add(index)
+        return self._update_domains(dirty_rows, dirty_cols)
+
+    def _search(self, budget: int, rng: random.Random) -> Optional[bool]:
+        """ Backtrack from the root on an explicit stack; None if the node budget runs out first. """
+        # Each frame: chosen line, iterator over its untried configurations and the one being tried
+        # (undo data lives in self.trail)
+        stack = []
+        nodes = 0
+        while True:
+            # Branch on the most constrained line; if every line is settled, solution found
+            choice = self._select_line()
+            if choice is None:
+                self.trail = []
+                return True
+            kind, index = choice
+            masks = self._line_state(kind)[0][index].tolist()
+            rng.shuffle(masks)
+            stack.append([kind, index, iter(masks), None])
+            self.trail.append([])
+
+            # Advance to the next consistent configuration, popping lines whose options are exhausted
+            while True:
+                if not stack:
+                    return False
+                frame = stack[-1]
+                kind, index, masks, tried = frame
+                self._undo_level()  # Backtrack the previous try at this level
+                if tried is not None and len(stack) == 1:
+                    # Refuted straight from the root state, so it stays refuted after a restart
+                    self.nogoods.append((kind, index, tried))
+                frame[3] = mask = next(masks, None)
+                if mask is None:
+                    stack.pop()
+                    self.trail.pop()
+                    continue
+                nodes += 1
+                if nodes > budget:
+                    # Out of budget: unwind every level back to the root state
+                    while self.trail:
+                        self._undo_level()
+                        self.trail.pop()
+                    return None
+                if self._update_domains(*self._assign_line(kind, index, mask)):
+                    break
+
     def solve(self) -> bool:
-        """ Solve the nonogram puzzle using constraint propagation and backtracking. """
+        """ Solve the nonogram puzzle using constraint propagation and backtracking with randomized restarts. """
         # Update domains and check consistency
+        self.trail = []
+        self.nogoods = []
         if not self._update_domains():
             return False
 
-        # Find cell with smallest domain intersection (Most constrained variable)
-        min_options = float('inf')
-        best_pos = None
-        best_values = None
-
-        for i in range(self.height):
-            for j in range(self.width):
-                if self.grid[i][j] is None:
-                    row_values = {poss[j] for poss in self.row_domains[i]}
-                    col_values = {poss[i] for poss in self.col_domains[j]}
-                    common_values = row_values & col_values
-                    if len(common_values) < min_options:
-                        min_options = len(common_values)
-                        best_pos = (i, j)
-                        best_values = common_values
-
-        # If no empty cells, solution found
-        if not best_pos:
-            return True
-
-        # Try each possible value for the chosen cell
-        i, j = best_pos
-        for value in best_values:
-            self.grid[i][j] = value
-            if self.solve():  # Recursive solving
-                return True
-            self.grid[i][j] = None  # Backtrack if no solution
-
-        return False
+        # Restart with a fresh value order whenever a run exceeds its Luby-scheduled node budget
+        for run in count(1):
+            result = self._search(luby(run) * self.RESTART_BUDGET, random.Random(run))
+            if result is not None:
+                return result
+            if not self._apply_nogoods():
+                return False
 
     def print_solution(self):
         """Print the solved nonogram grid"""
-        if not any(None in row for row in self.grid):
+        if not np.any(self.grid == -1):
             for row in self.grid:
                 print(''.join('██' if cell == 1 else '  ' for cell in row))
         else:
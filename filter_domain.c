@@ -0,0 +1,114 @@
+/*
+ * Optional native domain filter for Nonogram.py (lines of at most 64 cells).
+ *
+ * Build it next to Nonogram.py with:
+ *     cc -O3 -shared -fPIC -o _filter_domain.so filter_domain.c
+ * On x86 the AVX2 loop is compiled in regardless of -m flags and only taken when the running CPU
+ * supports AVX2; everywhere else the portable scalar loop is used.
+ */
+#include <stddef.h>
+#include <stdint.h>
+
+#if defined(__x86_64__) || defined(__i386__)
+#define FILTER_HAVE_AVX2 1
+#include <immintrin.h>
+
+/* For every 4-bit lane mask: 32-bit lane indices that move the selected 64-bit lanes to the front */
+static const int32_t compress_table[16][8] = {
+    {0, 1, 0, 1, 0, 1, 0, 1},
+    {0, 1, 0, 1, 0, 1, 0, 1},
+    {2, 3, 0, 1, 0, 1, 0, 1},
+    {0, 1, 2, 3, 0, 1, 0, 1},
+    {4, 5, 0, 1, 0, 1, 0, 1},
+    {0, 1, 4, 5, 0, 1, 0, 1},
+    {2, 3, 4, 5, 0, 1, 0, 1},
+    {0, 1, 2, 3, 4, 5, 0, 1},
+    {6, 7, 0, 1, 0, 1, 0, 1},
+    {0, 1, 6, 7, 0, 1, 0, 1},
+    {2, 3, 6, 7, 0, 1, 0, 1},
+    {0, 1, 2, 3, 6, 7, 0, 1},
+    {4, 5, 6, 7, 0, 1, 0, 1},
+    {0, 1, 4, 5, 6, 7, 0, 1},
+    {2, 3, 4, 5, 6, 7, 0, 1},
+    {0, 1, 2, 3, 4, 5, 6, 7},
+};
+
+__attribute__((target("avx2")))
+static inline __m256i compress_indices(int lanes)
+{
+    return _mm256_loadu_si256((const __m256i *)compress_table[lanes]);
+}
+#endif
+
+/* Scalar split of domain[i..n), continuing the counts and OR / AND accumulated so far */
+static size_t filter_scalar(const uint64_t *domain, size_t i, size_t n, uint64_t fixed, uint64_t value,
+                            uint64_t *kept, uint64_t *dropped, size_t count, size_t rejected,
+                            uint64_t *any_on, uint64_t *all_on)
+{
+    for (; i < n; i++) {
+        uint64_t mask = domain[i];
+        if ((mask & fixed) == value) {
+            kept[count++] = mask;
+            *any_on |= mask;
+            *all_on &= mask;
+        } else {
+            dropped[rejected++] = mask;
+        }
+    }
+    return count;
+}
+
+#ifdef FILTER_HAVE_AVX2
+__attribute__((target("avx2")))
+static size_t filter_avx2(const uint64_t *domain, size_t n, uint64_t fixed, uint64_t value,
+                          uint64_t *kept, uint64_t *dropped, uint64_t *any_out, uint64_t *all_out)
+{
+    size_t count = 0, rejected = 0, i = 0;
+    const __m256i ones = _mm256_set1_epi64x(-1);
+    const __m256i fixed4 = _mm256_set1_epi64x((long long)fixed);
+    const __m256i value4 = _mm256_set1_epi64x((long long)value);
+    __m256i any4 = _mm256_setzero_si256();
+    __m256i all4 = ones;
+    uint64_t lanes[4];
+
+    /* count and rejected never pass i, so the full 4-lane stores stay inside the n-entry buffers */
+    for (; i + 4 <= n; i += 4) {
+        __m256i masks = _mm256_loadu_si256((const __m256i *)(domain + i));
+        __m256i match = _mm256_cmpeq_epi64(_mm256_and_si256(masks, fixed4), value4);
+        int bits = _mm256_movemask_pd(_mm256_castsi256_pd(match));
+        int hits = __builtin_popcount(bits);
+
+        any4 = _mm256_or_si256(any4, _mm256_and_si256(masks, match));
+        all4 = _mm256_and_si256(all4, _mm256_or_si256(masks, _mm256_xor_si256(match, ones)));
+        _mm256_storeu_si256((__m256i *)(kept + count),
+                            _mm256_permutevar8x32_epi32(masks, compress_indices(bits)));
+        _mm256_storeu_si256((__m256i *)(dropped + rejected),
+                            _mm256_permutevar8x32_epi32(masks, compress_indices(bits ^ 15)));
+        count += hits;
+        rejected += 4 - hits;
+    }
+
+    _mm256_storeu_si256((__m256i *)lanes, any4);
+    *any_out = lanes[0] | lanes[1] | lanes[2] | lanes[3];
+    _mm256_storeu_si256((__m256i *)lanes, all4);
+    *all_out = lanes[0] & lanes[1] & lanes[2] & lanes[3];
+    return filter_scalar(domain, i, n, fixed, value, kept, dropped, count, rejected, any_out, all_out);
+}
+#endif
+
+/*
+ * Split domain[0..n) into configurations that match the decided cells ((mask & fixed) == value),
+ * written to kept, and the rest, written to dropped. Both buffers must hold n entries.
+ * Stores the OR / AND of the kept configurations in any_out / all_out and returns how many were kept.
+ */
+size_t filter_domain(const uint64_t *domain, size_t n, uint64_t fixed, uint64_t value,
+                     uint64_t *kept, uint64_t *dropped, uint64_t *any_out, uint64_t *all_out)
+{
+#ifdef FILTER_HAVE_AVX2
+    if (__builtin_cpu_supports("avx2"))
+        return filter_avx2(domain, n, fixed, value, kept, dropped, any_out, all_out);
+#endif
+    *any_out = 0;
+    *all_out = ~(uint64_t)0;
+    return filter_scalar(domain, 0, n, fixed, value, kept, dropped, 0, 0, any_out, all_out);
+}
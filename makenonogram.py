@@ -1,9 +1,38 @@
 import numpy as np
-from skimage import io, color, filters
+from skimage import io, color
 from skimage.transform import resize
+from skimage.util import img_as_float32
 from skimage.feature import canny
 from PIL import Image, ImageDraw, ImageFont
 
+try:
+    from numba import njit  # Optional: compiles the run-length kernel to native code
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _run_lengths_native(filled):
+        """ Return every run of filled cells row by row, plus the number of runs in each row. """
+        height, width = filled.shape
+        lengths = np.empty(height * ((width + 1) // 2), dtype=np.int64)
+        counts = np.zeros(height, dtype=np.int64)
+        total = 0
+        for i in range(height):
+            run = 0
+            for j in range(width + 1):
+                if j < width and filled[i, j]:
+                    run += 1
+                elif run:
+                    lengths[total] = run
+                    total += 1
+                    counts[i] += 1
+                    run = 0
+        return lengths[:total], counts
+else:
+    _run_lengths_native = None
+
 
 class NonogramCreator:
     """Class to create a Nonogram puzzle from an image using edge detection."""
@@ -16,8 +45,9 @@ class NonogramCreator:
         self.puzzle_grid = None
 
     def load_image(self):
-        """ Load and convert the image to grayscale. """
-        image = io.imread(self.img_path)
+        """ Load and convert the image to float32 grayscale. """
+        # Convert to float32 once so every later stage works on half-width pixels
+        image = img_as_float32(io.imread(self.img_path))
         # Convert RGB to grayscale if image is in color
         if len(image.shape) == 3:
             image = color.rgb2gray(image)
@@ -29,22 +59,19 @@ class NonogramCreator:
         """
         return resize(self.image, self.puzzle_size, anti_aliasing=True)
 
-    def contour_based(self, padding=5):
+    def contour_based(self, padding=5, sigma=0.7):
         """
         Generate a binary grid representing edges (puzzle grid) using contour detection.
 
         """
         downsampled = self.downsample_image()
-        # Apply padding around the downsampled image
+        # Apply padding around the downsampled image (Canny discards its outermost pixels)
         padded_image = np.pad(downsampled, pad_width=padding, mode='reflect')
-        # Smooth the padded image to reduce noise before edge detection
-        smoothed = filters.gaussian(padded_image, sigma=0.5)
-        # Detect edges using the Canny edge detector
-        edges = canny(smoothed, sigma=0.5)
-        # Remove padding to restore original dimensions
-        edges_cropped = edges[padding:-padding, padding:-padding]
-        # Convert edges to integers for binary grid representation
-        self.puzzle_grid = edges_cropped.astype(int)
+        # Detect edges using the Canny edge detector; its own Gaussian does the smoothing
+        # (sigma 0.7 matches the two chained 0.5 blurs this used to apply)
+        edges = canny(padded_image, sigma=sigma)
+        # Remove padding and keep a compact binary grid for the clue extraction
+        self.puzzle_grid = edges[padding:-padding, padding:-padding].astype(np.uint8)
         return self.puzzle_grid
 
     def generate_clues(self):
@@ -52,9 +79,9 @@ class NonogramCreator:
         Generate row and column clues for the Nonogram puzzle.
 
         """
-        # Generate clues by analyzing each row and column in the binary puzzle grid
-        row_clues = [self.extract_clues(row) for row in self.puzzle_grid]
-        col_clues = [self.extract_clues(col) for col in self.puzzle_grid.T]
+        # Generate clues by run-length encoding every row and column of the binary puzzle grid at once
+        row_clues = self.extract_grid_clues(self.puzzle_grid)
+        col_clues = self.extract_grid_clues(self.puzzle_grid.T)
         return row_clues, col_clues
 
     def extract_clues(self, line):
@@ -62,29 +89,36 @@ class NonogramCreator:
         Extract consecutive filled cell counts in a line (row or column).
 
         """
-        clues = []
-        count = 0
-        for cell in line:
-            # Count consecutive filled cells
-            if cell == 1:
-                count += 1
-            elif count > 0:
-                clues.append(count)
-                count = 0
-        if count > 0:
-            clues.append(count)
-        return clues if clues else [0]
+        return self.extract_grid_clues(np.asarray(line)[np.newaxis, :])[0]
+
+    def extract_grid_clues(self, grid):
+        """
+        Extract consecutive filled cell counts for every row of a 2D grid.
+
+        """
+        filled = (np.asarray(grid) == 1).astype(np.int8)
+        if _run_lengths_native is not None:
+            lengths, counts = _run_lengths_native(filled)
+        else:
+            # Pad each row with empty cells so every run has a rising and a falling edge
+            edges = np.diff(np.pad(filled, ((0, 0), (1, 1))), axis=1)
+            start_rows, starts = np.nonzero(edges == 1)
+            _, ends = np.nonzero(edges == -1)
+            lengths = ends - starts
+            counts = np.bincount(start_rows, minlength=filled.shape[0])
+        # Runs come out row by row, so split them at each row's run count
+        return [runs.tolist() or [0] for runs in np.split(lengths, np.cumsum(counts)[:-1])]
 
     def trim_grid(self):
         """
-        Remove empty rows and columns from the puzzle grid for a cleaner output.
+        Remove empty rows and columns around the picture in the puzzle grid for a cleaner output.
         """
-        # Remove empty rows
-        row_non_empty = np.any(self.puzzle_grid, axis=1)
-        self.puzzle_grid = self.puzzle_grid[row_non_empty, :]
-        # Remove empty columns
-        col_non_empty = np.any(self.puzzle_grid, axis=0)
-        self.puzzle_grid = self.puzzle_grid[:, col_non_empty]
+        # Find the first and last non-empty row and column
+        rows = np.flatnonzero(np.any(self.puzzle_grid, axis=1))
+        cols = np.flatnonzero(np.any(self.puzzle_grid, axis=0))
+        # Crop to that bounding box with a slice (a view, not a copy)
+        if rows.size and cols.size:
+            self.puzzle_grid = self.puzzle_grid[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
 
     def save_clues_to_file(self, row_clues, col_clues, output_file):
         """
@@ -123,16 +157,11 @@ class NonogramCreator:
         except IOError:
             font = ImageFont.load_default()
 
-        # Draw filled cells in the grid
-        for i in range(num_rows):
-            for j in range(num_cols):
-                if self.puzzle_grid[i, j] == 1:  # Filled cell
-                    x = max_row_clues * cell_size + j * cell_size
-                    y = max_col_clues * cell_size + i * cell_size
-                    draw.rectangle(
-                        [x, y, x + cell_size, y + cell_size],
-                        fill="black"
-                    )
+        # Draw filled cells in the grid: scale each cell to a cell_size block and paste them in one go
+        filled = (np.asarray(self.puzzle_grid) == 1).astype(np.uint8) * 255
+        cells = np.kron(filled, np.ones((cell_size, cell_size), dtype=np.uint8))
+        cell_image = Image.fromarray(255 - cells).convert("RGB")
+        image.paste(cell_image, (max_row_clues * cell_size, max_col_clues * cell_size))
 
         # Draw grid lines
         for i in range(num_rows + 1):
@@ -165,7 +194,7 @@ class NonogramCreator:
 
         """
         self.contour_based()  # Generate the edge-based puzzle grid
-        self.trim_grid()  # Remove empty rows and columns
+        self.trim_grid()  # Crop empty rows and columns around the picture
         row_clues, col_clues = self.generate_clues()  # Extract clues
         self.save_clues_to_file(row_clues, col_clues, output_text_file)  # Save clues to file
         self.display_puzzle_with_clues(row_clues, col_clues, output_image_file)  # Display puzzle